@@ -37,6 +37,18 @@ import {
 } from "../utils";
 import { InstanceMethods, MessageTypes } from "../enums";
 
+/**
+ * JSON replacer used when posting messages to the frame.
+ * Functions are serialized to their source so they can be executed on the other side.
+ *
+ * Defined once at module level so a new closure is not allocated for every message.
+ */
+const serializeFunctions = (_: string, value: unknown) =>
+  typeof value === "function" ? value.toString() : value;
+
+/** Maximum number of frame paths kept in the iframe path cache. */
+const PATH_CACHE_LIMIT = 50;
+
 /**
  * Represents an SDK instance for managing frames and communication with DocSpace.
  *
@@ -72,6 +84,18 @@ export class SDKInstance {
     styleCache: Map<string, Partial<CSSStyleDeclaration>>;
   };
 
+  private static _pendingCSPValidations = new Map<string, Promise<void>>();
+
+  /**
+   * Builds the key under which the frame path for the given configuration is cached.
+   *
+   * @param config - The configuration object for the frame
+   * @returns The path cache key
+   */
+  #getPathCacheKey({ mode, id, frameId }: TFrameConfig): string {
+    return `${mode}_${id || ""}_${frameId}`;
+  }
+
   /**
    * Creates and returns a loader HTML element with specified configuration.
    *
@@ -88,20 +112,16 @@ export class SDKInstance {
     if (!styleCache.has(loaderClassName)) {
       const style = document.createElement("style");
       style.textContent = getLoaderStyle(loaderClassName);
-
-      const fragment = document.createDocumentFragment();
-      fragment.appendChild(style);
-      document.head.appendChild(fragment);
+      document.head.appendChild(style);
 
       styleCache.set(loaderClassName, style);
     }
 
     let container: HTMLElement;
+    const template = templateCache.get(templateKey);
 
-    if (templateCache.has(templateKey)) {
-      container = templateCache
-        .get(templateKey)!
-        .cloneNode(true) as HTMLElement;
+    if (template) {
+      container = template.cloneNode(true) as HTMLElement;
       container.id = `${frameId}-loader`;
     } else {
       container = SDKInstance._loaderCache.container.cloneNode() as HTMLElement;
@@ -134,13 +154,18 @@ export class SDKInstance {
    * Creates and configures an HTMLIFrameElement based on the provided configuration.
    *
    * @param config - The configuration object for creating the iframe
+   * @param styleOverrides - Styles merged over the cached base styles before they are applied
    * @returns A configured HTMLIFrameElement instance
    *
    * @remarks
    * The method handles special configurations for mobile view and CSP validation.
    * If CSP validation fails, it sets an error message in the iframe's srcdoc.
+   * Base styles and overrides are merged first, so each style property is written to the element once.
    */
-  #createIframe = (config: TFrameConfig): HTMLIFrameElement => {
+  #createIframe = (
+    config: TFrameConfig,
+    styleOverrides: Partial<CSSStyleDeclaration> = {}
+  ): HTMLIFrameElement => {
     if (!SDKInstance._iframeCache) {
       const template = document.createElement("iframe");
       template.allowFullscreen = true;
@@ -153,29 +178,37 @@ export class SDKInstance {
       };
     }
 
-    const { mode, id, frameId, type, width, height, src, events, checkCSP } =
-      config;
+    const { template, pathCache, styleCache } = SDKInstance._iframeCache;
+    const { frameId, type, width, height, src, events, checkCSP } = config;
     const isMobile = type === "mobile";
 
-    const iframe =
-      SDKInstance._iframeCache.template.cloneNode() as HTMLIFrameElement;
+    const iframe = template.cloneNode() as HTMLIFrameElement;
 
-    const cacheKey = `${mode}_${id || ""}_${frameId}`;
+    const cacheKey = this.#getPathCacheKey(config);
     const styleCacheKey = `${width}_${height}_${
       isMobile ? "mobile" : "desktop"
     }`;
 
-    let path = SDKInstance._iframeCache.pathCache.get(cacheKey);
-    if (!path) {
+    let path = pathCache.get(cacheKey);
+
+    if (path) {
+      // Re-insert to mark the entry as most recently used
+      pathCache.delete(cacheKey);
+    } else {
       path = getFramePath(config);
-      SDKInstance._iframeCache.pathCache.set(cacheKey, path);
+
+      if (pathCache.size >= PATH_CACHE_LIMIT) {
+        pathCache.delete(pathCache.keys().next().value!);
+      }
     }
 
+    pathCache.set(cacheKey, path);
+
     iframe.id = frameId;
     iframe.name = `${FRAME_NAME}__#${frameId}`;
     iframe.src = src + path;
 
-    let styleObj = SDKInstance._iframeCache.styleCache.get(styleCacheKey);
+    let styleObj = styleCache.get(styleCacheKey);
 
     if (!styleObj) {
       styleObj = {
@@ -189,10 +222,10 @@ export class SDKInstance {
           webkitOverflowScrolling: "touch",
         }),
       };
-      SDKInstance._iframeCache.styleCache.set(styleCacheKey, styleObj);
+      styleCache.set(styleCacheKey, styleObj);
     }
 
-    Object.assign(iframe.style, styleObj);
+    Object.assign(iframe.style, { ...styleObj, ...styleOverrides });
 
     if (isMobile) {
       if (document.body.style.overscrollBehaviorY !== "contain") {
@@ -214,6 +247,10 @@ export class SDKInstance {
   /**
    * Sets up CSP validation for the iframe
    *
+   * Frames initialized against the same source while a validation is in flight
+   * share that request. Once it settles, the next initialization checks again,
+   * since the CSP settings can change on the server.
+   *
    * @param iframe - The iframe element to validate
    * @param src - The source URL to validate against
    * @param events - Event handlers that might be triggered
@@ -224,7 +261,17 @@ export class SDKInstance {
     events?: TFrameEvents
   ): void {
     requestAnimationFrame(() => {
-      validateCSP(src).catch((e: Error) => {
+      const pendingValidations = SDKInstance._pendingCSPValidations;
+      let validation = pendingValidations.get(src);
+
+      if (!validation) {
+        validation = validateCSP(src).finally(() =>
+          pendingValidations.delete(src)
+        );
+        pendingValidations.set(src, validation);
+      }
+
+      validation.catch((e: Error) => {
         events?.onAppError?.(e.message);
         iframe.srcdoc = getCSPErrorBody(src);
         this.setIsLoaded();
@@ -240,6 +287,7 @@ export class SDKInstance {
    * This method modifies the styles of the target frame to make it visible and adjusts its dimensions
    * based on the configuration. It also ensures the parent node's height is set to inherit.
    * Uses performance-optimized transitions for smooth appearance.
+   * Loader removal and frame styling are applied together in a single animation frame.
    */
   setIsLoaded(): void {
     const { frameId, width, height, events } = this.config;
@@ -258,8 +306,12 @@ export class SDKInstance {
 
         if (loader) {
           loader.style.opacity = "0";
+        } else {
+          events?.onContentReady?.();
+        }
 
-          requestAnimationFrame(() => {
+        requestAnimationFrame(() => {
+          if (loader) {
             try {
               if (loader.parentNode) {
                 loader.parentNode.removeChild(loader);
@@ -270,12 +322,8 @@ export class SDKInstance {
               console.error("Error removing loader:", error);
               events?.onContentReady?.();
             }
-          });
-        } else {
-          events?.onContentReady?.();
-        }
+          }
 
-        requestAnimationFrame(() => {
           Object.assign(targetFrame.style, {
             opacity: "1",
             position: "relative",
@@ -319,9 +367,7 @@ export class SDKInstance {
       };
 
       iframe.contentWindow.postMessage(
-        JSON.stringify(messageEnvelope, (_, value) =>
-          typeof value === "function" ? value.toString() : value
-        ),
+        JSON.stringify(messageEnvelope, serializeFunctions),
         src
       );
     } catch (error) {
@@ -340,6 +386,12 @@ export class SDKInstance {
     try {
       if (typeof e.data !== "string") return;
 
+      // Messages addressed to this frame always contain its JSON-escaped
+      // frameId, so unrelated window messages are dropped without being parsed.
+      const escapedFrameId = JSON.stringify(this.config.frameId).slice(1, -1);
+
+      if (!e.data.includes(escapedFrameId)) return;
+
       const data = this.#parseMessageData(e.data);
 
       if (data.frameId !== this.config.frameId) return;
@@ -542,11 +594,9 @@ export class SDKInstance {
 
         parentNode.replaceChild(restoredTarget, existingContainer);
 
-        const cacheKey = `${this.config.mode}_${this.config.id || ""}_${
-          this.config.frameId
-        }`;
-
-        SDKInstance._iframeCache.pathCache.delete(cacheKey);
+        SDKInstance._iframeCache.pathCache.delete(
+          this.#getPathCacheKey(this.config)
+        );
 
         return this.#setupContainer(restoredTarget);
       }
@@ -586,9 +636,7 @@ export class SDKInstance {
    * @returns The configured iframe element
    */
   #setupIframe(): HTMLIFrameElement {
-    const iframe = this.#createIframe(this.config);
-
-    Object.assign(iframe.style, {
+    return this.#createIframe(this.config, {
       opacity: this.config.noLoader ? "1" : "0",
       zIndex: "2",
       position: this.config.noLoader ? "relative" : "absolute",
@@ -597,8 +645,6 @@ export class SDKInstance {
       top: "0",
       left: "0",
     });
-
-    return iframe;
   }
 
   /**
@@ -643,9 +689,6 @@ export class SDKInstance {
     if (!this.config.noLoader) {
       const frameLoader = this.#createLoader(this.config);
       fragment.appendChild(frameLoader);
-    } else {
-      container.style.height = this.config.height!;
-      container.style.width = this.config.width!;
     }
 
     container.appendChild(fragment);
@@ -726,10 +769,9 @@ export class SDKInstance {
       }
 
       if (SDKInstance._iframeCache) {
-        const cacheKey = `${this.config.mode}_${this.config.id || ""}_${
-          this.config.frameId
-        }`;
-        SDKInstance._iframeCache.pathCache.delete(cacheKey);
+        SDKInstance._iframeCache.pathCache.delete(
+          this.#getPathCacheKey(this.config)
+        );
       }
     }
 
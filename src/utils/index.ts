@@ -36,11 +36,17 @@ export const customUrlSearchParams = (
 ) => {
   if (!data) return "";
 
-  Object.keys(data).forEach(
-    (key) => (data[key] === undefined || data[key] === null) && delete data[key]
-  );
+  const searchParams = new URLSearchParams();
+
+  for (const key of Object.keys(data)) {
+    const value = data[key];
+
+    if (value !== undefined && value !== null) {
+      searchParams.append(key, String(value));
+    }
+  }
 
-  return new URLSearchParams(data as Record<string, string>).toString();
+  return searchParams.toString();
 };
 
 /**
@@ -70,18 +76,23 @@ export const validateCSP = async (targetSrc: string) => {
     response: { domains },
   } = json;
 
-  const currentSrcHost = host || new URL(origin).host;
+  const currentSrcHost = (host || new URL(origin).host).toLowerCase();
 
-  const normalizedDomains = domains.map((domain: string) => {
+  const normalizeDomain = (domain: string) => {
     try {
       const url = new URL(domain.toLowerCase());
       return url.host + (url.pathname !== "/" ? url.pathname : "");
     } catch {
       return domain;
     }
-  });
+  };
+
+  // Normalize lazily; stop at the first allowed domain
+  const isAllowed = domains.some(
+    (domain: string) => normalizeDomain(domain) === currentSrcHost
+  );
 
-  if (!normalizedDomains.includes(currentSrcHost.toLowerCase())) {
+  if (!isAllowed) {
     throw new Error(cspErrorText);
   }
 };
@@ -130,6 +141,22 @@ export const getConfigFromParams = (): TFrameConfig | null => {
   return configTemplate;
 };
 
+/**
+ * Appends the given options to a path as a query string.
+ *
+ * @param path - The base path.
+ * @param data - The options to serialize with {@link customUrlSearchParams}.
+ * @returns The path with the query string, or the bare path if no options are set.
+ */
+const withSearchParams = (
+  path: string,
+  data: Parameters<typeof customUrlSearchParams>[0]
+) => {
+  const urlParams = customUrlSearchParams(data);
+
+  return urlParams ? `${path}?${urlParams}` : path;
+};
+
 /**
  * Generates a URL path based on the provided configuration.
  *
@@ -207,9 +234,7 @@ export const getFramePath = (config: TFrameConfig) => {
         ...baseSelectorOptions,
       };
 
-      const urlParams = customUrlSearchParams(roomSelectorConfig);
-
-      return `/sdk/room-selector${urlParams ? `?${urlParams}` : ""}`;
+      return withSearchParams("/sdk/room-selector", roomSelectorConfig);
     }
 
     case SDKMode.FileSelector: {
@@ -223,9 +248,7 @@ export const getFramePath = (config: TFrameConfig) => {
         subtitle: config.withSubtitle,
       };
 
-      const urlParams = customUrlSearchParams(fileSelectorConfig);
-
-      return `/sdk/file-selector${urlParams ? `?${urlParams}` : ""}`;
+      return withSearchParams("/sdk/file-selector", fileSelectorConfig);
     }
 
     case SDKMode.PublicRoom: {
@@ -238,14 +261,11 @@ export const getFramePath = (config: TFrameConfig) => {
         showTitle: config.showTitle,
       };
 
-      const urlParams = customUrlSearchParams(publicRoomConfig);
-
-      return `/sdk/public-room${urlParams ? `?${urlParams}` : ""}`;
+      return withSearchParams("/sdk/public-room", publicRoomConfig);
     }
 
     case SDKMode.System: {
-      const urlParams = customUrlSearchParams(baseFrameOptions);
-      return `/old-sdk/system${urlParams ? `?${urlParams}` : ""}`;
+      return withSearchParams("/old-sdk/system", baseFrameOptions);
     }
 
     case SDKMode.Editor: {
@@ -254,11 +274,7 @@ export const getFramePath = (config: TFrameConfig) => {
         ...baseEditorOptions,
       };
 
-      const urlParams = customUrlSearchParams(editorConfig);
-
-      const path = `/doceditor${urlParams ? `?${urlParams}` : ""}`;
-
-      return path;
+      return withSearchParams("/doceditor", editorConfig);
     }
 
     case SDKMode.Viewer: {
@@ -268,11 +284,7 @@ export const getFramePath = (config: TFrameConfig) => {
         action: "view",
       };
 
-      const urlParams = customUrlSearchParams(viewerConfig);
-
-      const path = `/doceditor${urlParams ? `?${urlParams}` : ""}`;
-
-      return path;
+      return withSearchParams("/doceditor", viewerConfig);
     }
 
     default:
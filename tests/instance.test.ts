@@ -0,0 +1,198 @@
+/**
+ * (c) Copyright Ascensio System SIA 2025
+ *
+ * Licensed under the Apache License, Version 2.0 (the "License");
+ * you may not use this file except in compliance with the License.
+ * You may obtain a copy of the License at
+ *
+ *     http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS,
+ * WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+ * See the License for the specific language governing permissions and
+ * limitations under the License.
+ *
+ * @license
+ */
+
+import { MessageTypes, SDKMode } from "../src/enums";
+import { SDKInstance } from "../src/instance";
+import { cspErrorText } from "../src/constants";
+import { getCSPErrorBody } from "../src/utils";
+import type { TFrameConfig } from "../src/types";
+
+describe("SDKInstance", () => {
+  const src = "https://example.com";
+
+  const createFrame = (frameId: string, config: Partial<TFrameConfig> = {}) => {
+    const target = document.createElement("div");
+    target.id = frameId;
+    document.body.appendChild(target);
+
+    const frameConfig = { frameId, mode: SDKMode.Manager, src, ...config };
+    const instance = new SDKInstance(frameConfig);
+    const iframe = instance.initFrame(frameConfig) as HTMLIFrameElement;
+
+    return { instance, iframe };
+  };
+
+  const mockCSPDomains = (domains: string[]) => {
+    global.fetch = jest.fn(() =>
+      Promise.resolve({
+        json: () => Promise.resolve({ response: { domains } }),
+      })
+    ) as jest.Mock;
+  };
+
+  const flushPromises = () => new Promise((resolve) => setTimeout(resolve, 0));
+
+  const postMessage = (data: string) =>
+    window.dispatchEvent(new MessageEvent("message", { data }));
+
+  const originalFetch = global.fetch;
+  const originalRequestAnimationFrame = global.requestAnimationFrame;
+  const originalDocSpace = window.DocSpace;
+
+  beforeEach(() => {
+    document.body.innerHTML = "";
+    window.DocSpace = { SDK: { frames: {} } } as unknown as Window["DocSpace"];
+    global.requestAnimationFrame = (callback: FrameRequestCallback) => {
+      callback(0);
+      return 0;
+    };
+  });
+
+  afterEach(() => {
+    global.fetch = originalFetch;
+    global.requestAnimationFrame = originalRequestAnimationFrame;
+    window.DocSpace = originalDocSpace;
+  });
+
+  it("should share an in-flight CSP validation between frames with the same src", async () => {
+    mockCSPDomains(["localhost"]);
+
+    createFrame("frame-1");
+    createFrame("frame-2");
+
+    expect(global.fetch).toHaveBeenCalledTimes(1);
+
+    await flushPromises();
+    createFrame("frame-3");
+
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+  });
+
+  it("should report a failed CSP validation to every frame and retry it later", async () => {
+    mockCSPDomains(["another-domain.com"]);
+
+    const onAppError1 = jest.fn();
+    const onAppError2 = jest.fn();
+
+    const { iframe: iframe1 } = createFrame("frame-1", {
+      events: { onAppError: onAppError1 },
+    });
+    const { iframe: iframe2 } = createFrame("frame-2", {
+      events: { onAppError: onAppError2 },
+    });
+
+    await flushPromises();
+
+    expect(global.fetch).toHaveBeenCalledTimes(1);
+    expect(onAppError1).toHaveBeenCalledWith(cspErrorText);
+    expect(onAppError2).toHaveBeenCalledWith(cspErrorText);
+    expect(iframe1.srcdoc).toBe(getCSPErrorBody(src));
+    expect(iframe2.srcdoc).toBe(getCSPErrorBody(src));
+
+    createFrame("frame-3");
+
+    expect(global.fetch).toHaveBeenCalledTimes(2);
+  });
+
+  it("should ignore foreign messages and handle messages for a frameId with quotes", () => {
+    const frameId = 'frame"quoted';
+    const onAppReady = jest.fn();
+    const warnSpy = jest.spyOn(console, "warn").mockImplementation(() => {});
+
+    const { instance, iframe } = createFrame(frameId, {
+      checkCSP: false,
+      events: { onAppReady },
+    });
+    iframe.dispatchEvent(new Event("load"));
+
+    postMessage("foreign message");
+    postMessage(
+      JSON.stringify({
+        frameId: "other-frame",
+        type: MessageTypes.OnEventReturn,
+        eventReturnData: { event: "onAppReady" },
+      })
+    );
+
+    expect(warnSpy).not.toHaveBeenCalled();
+    expect(onAppReady).not.toHaveBeenCalled();
+
+    postMessage(
+      JSON.stringify({
+        frameId,
+        type: MessageTypes.OnEventReturn,
+        eventReturnData: { event: "onAppReady" },
+      })
+    );
+
+    expect(onAppReady).toHaveBeenCalledTimes(1);
+
+    instance.destroyFrame();
+    warnSpy.mockRestore();
+  });
+
+  it("should handle messages under a frameId changed by setConfig", async () => {
+    const { instance, iframe } = createFrame("frame-1", { checkCSP: false });
+    iframe.dispatchEvent(new Event("load"));
+
+    const setConfigResult = instance.setConfig({
+      ...instance.config,
+      frameId: "frame-2",
+    });
+
+    postMessage(
+      JSON.stringify({
+        frameId: "frame-2",
+        type: MessageTypes.OnMethodReturn,
+        methodReturnData: { updated: true },
+      })
+    );
+
+    await expect(setConfigResult).resolves.toEqual({ updated: true });
+
+    instance.destroyFrame();
+  });
+
+  it("should evict the least recently used frame path past the cache limit", () => {
+    // The first frame initializes the shared iframe cache
+    createFrame("lru-warmup", { checkCSP: false });
+
+    const { pathCache } = (
+      SDKInstance as unknown as {
+        _iframeCache: { pathCache: Map<string, string> };
+      }
+    )._iframeCache;
+    pathCache.clear();
+
+    for (let i = 0; i < 50; i++) {
+      createFrame(`lru-${i}`, { checkCSP: false });
+    }
+
+    expect(pathCache.size).toBe(50);
+
+    // Re-rendering into a fresh target reuses, and refreshes, the cached path
+    document.getElementById("lru-0-container")!.remove();
+    createFrame("lru-0", { checkCSP: false });
+    createFrame("lru-50", { checkCSP: false });
+
+    expect(pathCache.size).toBe(50);
+    expect(pathCache.has("manager__lru-0")).toBe(true);
+    expect(pathCache.has("manager__lru-1")).toBe(false);
+    expect(pathCache.has("manager__lru-50")).toBe(true);
+  });
+});
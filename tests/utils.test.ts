@@ -65,6 +65,19 @@ describe("customUrlSearchParams", () => {
     });
     expect(params.toString()).toBe("key1=value1&key2=value2");
   });
+
+  it("should skip null and undefined values without mutating the input", () => {
+    const data = { key1: "value1", key2: null, key3: undefined, key4: 0 };
+    const params = customUrlSearchParams(data);
+
+    expect(params.toString()).toBe("key1=value1&key4=0");
+    expect(data).toEqual({
+      key1: "value1",
+      key2: null,
+      key3: undefined,
+      key4: 0,
+    });
+  });
 });
 
 describe("validateCSP", () => {
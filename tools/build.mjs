@@ -17,9 +17,12 @@
  */
 
 import { build } from "esbuild";
-import { execSync } from "child_process";
+import { exec } from "child_process";
+import { promisify } from "util";
 import esbuildPluginTsc from "esbuild-plugin-tsc";
 
+const execAsync = promisify(exec);
+
 const baseOptions = {
   bundle: true,
   minify: true,
@@ -40,9 +43,11 @@ const typescriptPlugin = esbuildPluginTsc({ force: true });
 const declarationsPlugin = {
   name: "TypeScriptDeclarationsPlugin",
   setup(build) {
-    build.onEnd((result) => {
+    build.onEnd(async (result) => {
       if (result.errors.length === 0) {
-        execSync("tsc --outDir ./dist/types");
+        // Run tsc as a child process without blocking the event loop,
+        // so the other bundles keep building while declarations are emitted.
+        await execAsync("tsc --outDir ./dist/types");
       }
     });
   },